@@ -10,6 +10,14 @@ from pathlib import Path
 # Database path
 DB_PATH = Path(__file__).parent / "bot.db"
 
+# Publication detail columns and their types
+NEW_COLUMNS = [
+    ("channel_id", "VARCHAR(255)"),
+    ("post_link", "TEXT"),
+    ("amount_paid", "DECIMAL(10, 2)"),
+    ("placement_duration", "VARCHAR(100)"),
+]
+
 def migrate():
     """Add new columns to ads table if they don't exist."""
     conn = sqlite3.connect(DB_PATH)
@@ -20,22 +28,18 @@ def migrate():
         cursor.execute("PRAGMA table_info(ads)")
         columns = [row[1] for row in cursor.fetchall()]
         
-        # Add missing columns
-        if 'channel_id' not in columns:
-            print("Adding channel_id column...")
-            cursor.execute("ALTER TABLE ads ADD COLUMN channel_id VARCHAR(255)")
-            
-        if 'post_link' not in columns:
-            print("Adding post_link column...")
-            cursor.execute("ALTER TABLE ads ADD COLUMN post_link TEXT")
-            
-        if 'amount_paid' not in columns:
-            print("Adding amount_paid column...")
-            cursor.execute("ALTER TABLE ads ADD COLUMN amount_paid DECIMAL(10, 2)")
-            
-        if 'placement_duration' not in columns:
-            print("Adding placement_duration column...")
-            cursor.execute("ALTER TABLE ads ADD COLUMN placement_duration VARCHAR(100)")
+        missing = [(name, ddl) for name, ddl in NEW_COLUMNS if name not in columns]
+        
+        # Add missing columns in a single transaction
+        if missing:
+            print(f"Adding columns: {', '.join(name for name, _ in missing)}...")
+            conn.executescript(
+                "PRAGMA foreign_keys=OFF;\n"
+                "BEGIN;\n"
+                + "\n".join(f"ALTER TABLE ads ADD COLUMN {name} {ddl};" for name, ddl in missing)
+                + "\nCOMMIT;\n"
+                "PRAGMA foreign_keys=ON;"
+            )
         
         conn.commit()
         print("✅ Migration completed successfully!")
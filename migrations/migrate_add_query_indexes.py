@@ -0,0 +1,47 @@
+"""
+Migration script to add indexes used by repository queries.
+Run this once on databases created before the indexes were declared on the models.
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Database path
+DB_PATH = Path(__file__).parent.parent / "app.db"
+
+# Index name -> (table, columns); must match __table_args__ in database.py
+INDEXES = {
+    "ix_ads_user_status": ("ads", "user_id, status"),
+    "ix_ads_user_created": ("ads", "user_id, created_at"),
+    "ix_ads_status_created": ("ads", "status, created_at"),
+    "ix_ads_channel_status_created": ("ads", "channel_id, status, created_at"),
+    "ix_payments_user_status": ("payments", "user_id, status"),
+    "ix_payments_provider_external": ("payments", "provider, external_id"),
+}
+
+
+def migrate():
+    """Create missing indexes in one transaction."""
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        print("Creating indexes...")
+        conn.executescript(
+            "BEGIN;\n"
+            + "\n".join(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns});"
+                for name, (table, columns) in INDEXES.items()
+            )
+            + "\nANALYZE;\nCOMMIT;"
+        )
+        print("✅ Migration completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,104 @@
+"""
+Migration script to fill NULL created_at/updated_at timestamps.
+Rows inserted into tables created before the columns had a DEFAULT may have
+been stored without timestamps; this backfills them (safe to re-run).
+
+Uses DATABASE_URL when it points to PostgreSQL, otherwise the SQLite app.db.
+On PostgreSQL the missing column DEFAULT now() is added as well.
+"""
+
+import asyncio
+import os
+import sqlite3
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Database path
+DB_PATH = Path(__file__).parent.parent / "app.db"
+
+# Table -> column -> columns to take the value from, in order, before falling back to now
+TIMESTAMP_COLUMNS = {
+    "users": {
+        "created_at": ("updated_at",),
+        "updated_at": ("created_at",),
+    },
+    "ads": {
+        "created_at": ("published_at", "updated_at"),
+        "updated_at": ("created_at",),
+    },
+    "payments": {
+        "created_at": ("paid_at",),
+    },
+    "tariffs": {
+        "created_at": (),
+    },
+}
+
+
+def backfill_statements(now_sql: str):
+    """Build one UPDATE per timestamp column that only touches NULL rows."""
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column, fallbacks in columns.items():
+            value = f"COALESCE({', '.join(fallbacks)}, {now_sql})" if fallbacks else now_sql
+            yield table, column, f"UPDATE {table} SET {column} = {value} WHERE {column} IS NULL"
+
+
+def migrate_sqlite():
+    """Backfill NULL timestamps (SQLite)."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    try:
+        for table, column, statement in backfill_statements("CURRENT_TIMESTAMP"):
+            cursor.execute(statement)
+            print(f"{table}.{column}: {cursor.rowcount} rows filled")
+
+        conn.commit()
+        print("✅ Migration completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+async def migrate_postgres(database_url: str):
+    """Add DEFAULT now() and backfill NULL timestamps (PostgreSQL)."""
+    import asyncpg
+
+    # asyncpg expects a plain postgresql:// DSN without the SQLAlchemy driver suffix
+    conn = await asyncpg.connect(database_url.replace("+asyncpg", ""))
+
+    try:
+        async with conn.transaction():
+            for table, columns in TIMESTAMP_COLUMNS.items():
+                for column in columns:
+                    await conn.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT now()")
+
+            for table, column, statement in backfill_statements("now()"):
+                status = await conn.execute(statement)
+                print(f"{table}.{column}: {status.split()[-1]} rows filled")
+
+        print("✅ Migration completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        raise
+    finally:
+        await conn.close()
+
+
+def migrate():
+    """Run the migration against the configured database."""
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL", "")
+    if database_url.startswith("postgres"):
+        asyncio.run(migrate_postgres(database_url))
+    else:
+        migrate_sqlite()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,131 @@
+"""
+Migration script to store money columns as integer minor units.
+Run this once to convert existing DECIMAL amounts (kopecks, cents, 1e-6 USDT).
+
+Safe to re-run: already converted databases are detected and left as is.
+Uses DATABASE_URL when it points to PostgreSQL, otherwise the SQLite app.db.
+"""
+
+import asyncio
+import os
+import sqlite3
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Database path
+DB_PATH = Path(__file__).parent.parent / "app.db"
+
+# Minor units per currency (must match database.MINOR_UNITS)
+MINOR_UNITS = {"RUB": 100, "USD": 100, "USDT": 1_000_000}
+
+# Marker recorded once the SQLite data is converted
+MIGRATION_NAME = "money_to_minor_units"
+
+TARIFF_COLUMNS = {"price_rub": "RUB", "price_usd": "USD", "price_usdt": "USDT"}
+
+# Payment amount multiplier picked by the row's currency
+PAYMENT_UNITS_SQL = "CASE currency {} ELSE 1 END".format(
+    " ".join(f"WHEN '{currency}' THEN {units}" for currency, units in MINOR_UNITS.items())
+)
+
+
+def migrate_sqlite():
+    """Convert tariff prices and payment amounts to minor units (SQLite)."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("CREATE TABLE IF NOT EXISTS schema_migrations (name TEXT PRIMARY KEY)")
+        cursor.execute("SELECT 1 FROM schema_migrations WHERE name = ?", (MIGRATION_NAME,))
+        if cursor.fetchone():
+            print("⏭️  Money columns already converted, nothing to do")
+            return
+
+        # Tables created by the current models already declare BIGINT and hold minor units
+        cursor.execute("PRAGMA table_info(tariffs)")
+        column_types = {row[1]: row[2].upper() for row in cursor.fetchall()}
+        if column_types.get("price_rub") == "BIGINT":
+            print("⏭️  Tables already use minor units, recording migration")
+        else:
+            print("Converting tariff prices...")
+            cursor.execute(
+                "UPDATE tariffs SET "
+                "price_rub = CAST(ROUND(price_rub * ?) AS INTEGER), "
+                "price_usd = CAST(ROUND(price_usd * ?) AS INTEGER), "
+                "price_usdt = CAST(ROUND(price_usdt * ?) AS INTEGER)",
+                (MINOR_UNITS["RUB"], MINOR_UNITS["USD"], MINOR_UNITS["USDT"])
+            )
+
+            print("Converting payment amounts...")
+            cursor.execute(f"UPDATE payments SET amount = CAST(ROUND(amount * {PAYMENT_UNITS_SQL}) AS INTEGER)")
+
+        cursor.execute("INSERT INTO schema_migrations (name) VALUES (?)", (MIGRATION_NAME,))
+        conn.commit()
+        print("✅ Migration completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+async def migrate_postgres(database_url: str):
+    """Change money columns to BIGINT minor units (PostgreSQL)."""
+    import asyncpg
+
+    # asyncpg expects a plain postgresql:// DSN without the SQLAlchemy driver suffix
+    conn = await asyncpg.connect(database_url.replace("+asyncpg", ""))
+
+    try:
+        async with conn.transaction():
+            rows = await conn.fetch(
+                "SELECT table_name, column_name, data_type FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND table_name IN ('tariffs', 'payments')"
+            )
+            column_types = {(row["table_name"], row["column_name"]): row["data_type"] for row in rows}
+
+            # ALTER ... TYPE converts the values, so a BIGINT column means it is already done
+            tariff_changes = [
+                f"ALTER COLUMN {column} TYPE BIGINT USING ROUND({column} * {MINOR_UNITS[currency]})::BIGINT"
+                for column, currency in TARIFF_COLUMNS.items()
+                if column_types.get(("tariffs", column)) == "numeric"
+            ]
+            convert_payments = column_types.get(("payments", "amount")) == "numeric"
+            if not tariff_changes and not convert_payments:
+                print("⏭️  Money columns already converted, nothing to do")
+                return
+
+            if tariff_changes:
+                print("Converting tariff prices...")
+                await conn.execute(f"ALTER TABLE tariffs {', '.join(tariff_changes)}")
+
+            if convert_payments:
+                print("Converting payment amounts...")
+                await conn.execute(
+                    "ALTER TABLE payments ALTER COLUMN amount TYPE BIGINT "
+                    f"USING ROUND(amount * {PAYMENT_UNITS_SQL})::BIGINT"
+                )
+
+        print("✅ Migration completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        raise
+    finally:
+        await conn.close()
+
+
+def migrate():
+    """Run the migration against the configured database."""
+    load_dotenv()
+    database_url = os.getenv("DATABASE_URL", "")
+    if database_url.startswith("postgres"):
+        asyncio.run(migrate_postgres(database_url))
+    else:
+        migrate_sqlite()
+
+if __name__ == "__main__":
+    migrate()
@@ -2,41 +2,58 @@
 """
 Check all localization keys in handlers against ru.yml
 """
+import mmap
+import os
 import re
 import yaml
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# libyaml-backed loader when available
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# One pass over raw bytes for both lookup styles
+KEY_PATTERN = re.compile(rb'(?:MessageLoader\.get_message|localization\.get_text)\(["\']([^"\']+)["\']')
+
 def get_all_keys_from_yaml(yaml_file):
     """Get all keys from YAML file."""
     with open(yaml_file, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=SafeLoader)
     
-    def flatten_keys(d, prefix=''):
-        """Recursively flatten nested dict keys."""
-        keys = []
+    # Flatten nested dict keys with an explicit stack
+    keys = set()
+    stack = [(data, '')]
+    while stack:
+        d, prefix = stack.pop()
         for k, v in d.items():
             new_key = f"{prefix}.{k}" if prefix else k
             if isinstance(v, dict):
-                keys.extend(flatten_keys(v, new_key))
+                stack.append((v, new_key))
             else:
-                keys.append(new_key)
-        return keys
+                keys.add(new_key)
     
-    return set(flatten_keys(data))
+    return keys
+
+def get_used_keys_in_file(py_file):
+    """Get localization keys used in one file (memory-mapped, not read into memory)."""
+    with open(py_file, 'rb') as f:
+        if not py_file.stat().st_size:
+            return set()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return {m.group(1).decode('utf-8') for m in KEY_PATTERN.finditer(mm)}
 
 def get_all_used_keys(handlers_dir):
     """Get all localization keys used in handlers."""
     used_keys = set()
-    pattern = r'MessageLoader\.get_message\(["\']([^"\']+)["\']'
-    pattern2 = r'localization\.get_text\(["\']([^"\']+)["\']'
+    files = list(Path(handlers_dir).rglob('*.py'))
     
-    for py_file in Path(handlers_dir).rglob('*.py'):
-        with open(py_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            matches = re.findall(pattern, content)
-            matches2 = re.findall(pattern2, content)
-            used_keys.update(matches)
-            used_keys.update(matches2)
+    # Files are independent: scan them in worker processes
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for keys in executor.map(get_used_keys_in_file, files, chunksize=16):
+            used_keys.update(keys)
     
     return used_keys
 
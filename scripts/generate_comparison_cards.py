@@ -4,6 +4,11 @@ Generate comparison cards showing multiple tariff options.
 Simplified version with Latin text only.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+
 from PIL import Image, ImageDraw, ImageFont
 import os
 
@@ -22,29 +27,90 @@ TEXT = (44, 62, 80)
 GRAY = (236, 240, 241)
 CARD_BG = (250, 250, 250)
 
+# zlib level for PNG output: 1 encodes fastest, 9 gives the smallest files
+PNG_COMPRESS_LEVEL = int(os.getenv("PNG_COMPRESS_LEVEL", "1"))
+
+# Fonts
+FONT_BOLD = "/System/Library/Fonts/Supplemental/Arial Bold.ttf"
+FONT_REGULAR = "/System/Library/Fonts/Supplemental/Arial.ttf"
+
+
+@lru_cache(maxsize=None)
+def _font(path, size):
+    """Load a TrueType font once per (path, size)."""
+    return ImageFont.truetype(path, size)
+
+
+def load_fonts():
+    """Load card fonts, falling back to the default font if Arial is missing."""
+    try:
+        return {
+            "main": _font(FONT_BOLD, 40),
+            "title": _font(FONT_BOLD, 26),
+            "price": _font(FONT_BOLD, 36),
+            "text": _font(FONT_REGULAR, 20),
+            "small": _font(FONT_BOLD, 16),
+        }
+    except OSError:
+        default = ImageFont.load_default()
+        return dict.fromkeys(("main", "title", "price", "text", "small"), default)
+
+
+# Loaded once and shared by all generated cards
+FONTS = load_fonts()
+
+
+# Horizontal card divider: a 1px strip pasted instead of rasterized lines
+# (x + 20 .. x + CARD_W - 20 inclusive)
+_DIVIDER = Image.new('RGB', (CARD_W - 39, 1), GRAY)
+
 
-def create_comparison(tariffs, title_text, filename):
+@lru_cache(maxsize=512)
+def _text_width(text, font):
+    """Measure rendered text width once per (text, font)."""
+    bbox = font.getbbox(text)
+    return bbox[2] - bbox[0]
+
+
+@lru_cache(maxsize=2)
+def _build_card_template(highlight):
+    """Render the card shadow and body once; pasted for every card."""
+    # Rectangle corners are inclusive, hence the extra pixel
+    template = Image.new('RGBA', (CARD_W + 6, CARD_H + 6), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(template)
+    
+    # Shadow
+    draw.rounded_rectangle(
+        [(5, 5), (CARD_W + 5, CARD_H + 5)],
+        radius=12,
+        fill=(200, 200, 200)
+    )
+    
+    # Card
+    border = PRIMARY if highlight else GRAY
+    draw.rounded_rectangle(
+        [(0, 0), (CARD_W, CARD_H)],
+        radius=12,
+        fill=CARD_BG,
+        outline=border,
+        width=2
+    )
+    return template
+
+
+def create_comparison(tariffs, title_text, filename, fonts=FONTS):
     """Create comparison card."""
     img = Image.new('RGB', (TOTAL_W, TOTAL_H), BG)
     draw = ImageDraw.Draw(img)
     
-    # Fonts
-    try:
-        font_main = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Bold.ttf", 40)
-        font_title = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Bold.ttf", 26)
-        font_price = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Bold.ttf", 36)
-        font_text = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial.ttf", 20)
-        font_small = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Bold.ttf", 16)
-    except:
-        font_main = ImageFont.load_default()
-        font_title = ImageFont.load_default()
-        font_price = ImageFont.load_default()
-        font_text = ImageFont.load_default()
-        font_small = ImageFont.load_default()
+    font_main = fonts["main"]
+    font_title = fonts["title"]
+    font_price = fonts["price"]
+    font_text = fonts["text"]
+    font_small = fonts["small"]
     
     # Main title
-    title_bbox = draw.textbbox((0, 0), title_text, font=font_main)
-    title_w = title_bbox[2] - title_bbox[0]
+    title_w = _text_width(title_text, font_main)
     draw.text(((TOTAL_W - title_w) // 2, SPACING), title_text, fill=PRIMARY, font=font_main)
     
     y_offset = SPACING + 70
@@ -53,30 +119,16 @@ def create_comparison(tariffs, title_text, filename):
     for i, tariff in enumerate(tariffs):
         x = SPACING + (i * (CARD_W + SPACING))
         
-        # Shadow
-        draw.rounded_rectangle(
-            [(x + 5, y_offset + 5), (x + CARD_W + 5, y_offset + CARD_H + 5)],
-            radius=12,
-            fill=(200, 200, 200)
-        )
-        
-        # Card
-        border = PRIMARY if tariff.get("highlight") else GRAY
-        draw.rounded_rectangle(
-            [(x, y_offset), (x + CARD_W, y_offset + CARD_H)],
-            radius=12,
-            fill=CARD_BG,
-            outline=border,
-            width=2
-        )
+        # Shadow and card body
+        template = _build_card_template(bool(tariff.get("highlight")))
+        img.paste(template, (x, y_offset), template)
         
         cy = y_offset + 20
         
         # Badge
         if tariff.get("badge"):
             badge = tariff["badge"]
-            badge_bbox = draw.textbbox((0, 0), badge, font=font_small)
-            badge_w = badge_bbox[2] - badge_bbox[0]
+            badge_w = _text_width(badge, font_small)
             badge_x = x + (CARD_W - badge_w) // 2 - 8
             
             draw.rounded_rectangle(
@@ -89,34 +141,30 @@ def create_comparison(tariffs, title_text, filename):
         
         # Title
         title = tariff["title"]
-        title_bbox = draw.textbbox((0, 0), title, font=font_title)
-        title_w = title_bbox[2] - title_bbox[0]
+        title_w = _text_width(title, font_title)
         draw.text((x + (CARD_W - title_w) // 2, cy), title, fill=PRIMARY, font=font_title)
         cy += 40
         
         # Subtitle
         sub = tariff["subtitle"]
-        sub_bbox = draw.textbbox((0, 0), sub, font=font_text)
-        sub_w = sub_bbox[2] - sub_bbox[0]
+        sub_w = _text_width(sub, font_text)
         draw.text((x + (CARD_W - sub_w) // 2, cy), sub, fill=TEXT, font=font_text)
         cy += 45
         
         # Line
-        draw.line([(x + 20, cy), (x + CARD_W - 20, cy)], fill=GRAY, width=1)
+        img.paste(_DIVIDER, (x + 20, cy))
         cy += 25
         
         # Price
         price = tariff["price"]
-        price_bbox = draw.textbbox((0, 0), price, font=font_price)
-        price_w = price_bbox[2] - price_bbox[0]
+        price_w = _text_width(price, font_price)
         draw.text((x + (CARD_W - price_w) // 2, cy), price, fill=PRIMARY, font=font_price)
         cy += 50
         
         # Save
         if tariff.get("save"):
             save_txt = f"Save {tariff['save']}%"
-            save_bbox = draw.textbbox((0, 0), save_txt, font=font_small)
-            save_w = save_bbox[2] - save_bbox[0]
+            save_w = _text_width(save_txt, font_small)
             save_x = x + (CARD_W - save_w) // 2 - 8
             
             draw.rounded_rectangle(
@@ -128,7 +176,7 @@ def create_comparison(tariffs, title_text, filename):
             cy += 35
         
         # Line
-        draw.line([(x + 20, cy), (x + CARD_W - 20, cy)], fill=GRAY, width=1)
+        img.paste(_DIVIDER, (x + 20, cy))
         cy += 20
         
         # Features
@@ -136,10 +184,18 @@ def create_comparison(tariffs, title_text, filename):
             draw.text((x + 25, cy), feature, fill=TEXT, font=font_text)
             cy += 28
     
-    img.save(filename, 'PNG', quality=95)
+    # Encode in memory, then write the file in one call
+    buf = BytesIO()
+    img.save(buf, 'PNG', compress_level=PNG_COMPRESS_LEVEL)
+    Path(filename).write_bytes(buf.getbuffer())
     print(f"✓ {filename}")
 
 
+def _render_one(job):
+    """Render one (tariffs, title, filename) job; runs in a worker process."""
+    create_comparison(*job)
+
+
 def main():
     print("🎨 Generating comparison cards...")
     print()
@@ -299,14 +355,19 @@ def main():
         }
     ]
     
-    # Generate
-    create_comparison(onetime_rub, "One-Time Purchase", f"{OUTPUT_DIR}/comparison_onetime_RUB.png")
-    create_comparison(onetime_usd, "One-Time Purchase", f"{OUTPUT_DIR}/comparison_onetime_USD.png")
-    create_comparison(onetime_usdt, "One-Time Purchase", f"{OUTPUT_DIR}/comparison_onetime_USDT.png")
+    jobs = [
+        (onetime_rub, "One-Time Purchase", f"{OUTPUT_DIR}/comparison_onetime_RUB.png"),
+        (onetime_usd, "One-Time Purchase", f"{OUTPUT_DIR}/comparison_onetime_USD.png"),
+        (onetime_usdt, "One-Time Purchase", f"{OUTPUT_DIR}/comparison_onetime_USDT.png"),
+        
+        (sub_rub, "Subscription Plans", f"{OUTPUT_DIR}/comparison_sub_RUB.png"),
+        (sub_usd, "Subscription Plans", f"{OUTPUT_DIR}/comparison_sub_USD.png"),
+        (sub_usdt, "Subscription Plans", f"{OUTPUT_DIR}/comparison_sub_USDT.png"),
+    ]
     
-    create_comparison(sub_rub, "Subscription Plans", f"{OUTPUT_DIR}/comparison_sub_RUB.png")
-    create_comparison(sub_usd, "Subscription Plans", f"{OUTPUT_DIR}/comparison_sub_USD.png")
-    create_comparison(sub_usdt, "Subscription Plans", f"{OUTPUT_DIR}/comparison_sub_USDT.png")
+    # Generate: cards are independent, render them in parallel
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        list(executor.map(_render_one, jobs))
     
     print()
     print("✅ Created 6 comparison cards")
@@ -21,13 +21,16 @@ class Settings(BaseSettings):
     target_channel_name: str = Field(default="Основной канал", description="Target channel display name")
     
     # Database
-    database_url: str = Field(default="sqlite:///./app.db", description="Database connection URL")
+    database_url: str = Field(default="sqlite+aiosqlite:///./app.db", description="Database connection URL (async driver)")
+    pgbouncer_url: Optional[str] = Field(default=None, description="PgBouncer URL (transaction pooling), overrides database_url")
     
     # OpenAI
     openai_api_key: Optional[str] = Field(default=None, description="OpenAI API key for text/image generation")
     openai_model: str = Field(default="gpt-3.5-turbo", description="OpenAI model for text generation")
     openai_image_model: str = Field(default="dall-e-3", description="OpenAI model for image generation")
     openai_max_tokens: int = Field(default=1000, description="Max tokens for OpenAI text generation")
+    openai_max_concurrency: int = Field(default=20, description="Max concurrent OpenAI API requests")
+    openai_max_retries: int = Field(default=5, description="Retries (exponential backoff) on OpenAI rate limits and connection errors")
     
     # Default channel
     channel_id_default: int = Field(default=-1001234567890, description="Default channel ID for posting ads")
@@ -46,18 +49,18 @@ class Settings(BaseSettings):
     nowpayments_api_key: Optional[str] = Field(default=None, description="NOWPayments API key")
     nowpayments_ipn_secret: Optional[str] = Field(default=None, description="NOWPayments IPN secret")
     
-    # Application settings
-    webhook_url: Optional[str] = Field(default=None, description="Webhook URL for payment callbacks")
     # Webhook settings
     webhook_url: Optional[str] = Field(default=None, description="Webhook base URL")
     webhook_port: int = Field(default=8080, description="Webhook server port")
     webhook_path: str = Field(default="/webhook", description="Webhook path")
-    webhook_port: int = Field(default=8080, description="Webhook port")
+    webhook_host: str = Field(default="0.0.0.0", description="Webhook server bind host")
+    webhook_secret: Optional[str] = Field(default=None, description="Telegram webhook secret token (A-Z, a-z, 0-9, _ and -); random per start if unset")
     
     # Features toggles
     enable_openai_text: bool = Field(default=True, description="Enable OpenAI text generation")
     enable_openai_images: bool = Field(default=True, description="Enable OpenAI image generation")
     enable_receipts: bool = Field(default=True, description="Enable PDF receipt generation")
+    enable_response_cache: bool = Field(default=True, description="Reuse recent OpenAI text and image URLs for identical prompts")
     
     # Limits
     max_ad_text_length: int = Field(default=4000, description="Maximum ad text length")
@@ -78,7 +81,9 @@ class Settings(BaseSettings):
     log_file: str = Field(default="logs/bot.log", description="Log file path")
     
     # Redis (optional, for caching)
-    redis_url: Optional[str] = Field(default=None, description="Redis URL for caching")
+    redis_url: Optional[str] = Field(default=None, description="Redis URL for caching and FSM storage")
+    redis_max_connections: int = Field(default=50, description="Redis connection pool size")
+    fsm_ttl_seconds: int = Field(default=3600, description="TTL for abandoned FSM states and data")
     
     class Config:
         env_file = ".env"
@@ -97,7 +102,8 @@ class Currency:
     USD = "USD" 
     USDT = "USDT"
     
-    ALL = [RUB, USD, USDT]
+    VALUES = (RUB, USD, USDT)  # Ordered, for rendering
+    ALL = frozenset(VALUES)  # For membership checks
 
 
 class PaymentProvider:
@@ -114,7 +120,8 @@ class Language:
     EN = "en"
     ZH_TW = "zh-tw"
     
-    ALL = [RU, EN, ZH_TW]
+    VALUES = (RU, EN, ZH_TW)
+    ALL = frozenset(VALUES)
     DEFAULT = RU
 
 
@@ -127,7 +134,8 @@ class AdStatus:
     REJECTED = "rejected"
     PUBLISHED = "published"
     
-    ALL = [DRAFT, WAITING_PAYMENT, WAITING_MODERATION, APPROVED, REJECTED, PUBLISHED]
+    VALUES = (DRAFT, WAITING_PAYMENT, WAITING_MODERATION, APPROVED, REJECTED, PUBLISHED)
+    ALL = frozenset(VALUES)
 
 
 class PaymentStatus:
@@ -138,7 +146,8 @@ class PaymentStatus:
     EXPIRED = "expired"
     CANCELLED = "cancelled"
     
-    ALL = [PENDING, PAID, FAILED, EXPIRED, CANCELLED]
+    VALUES = (PENDING, PAID, FAILED, EXPIRED, CANCELLED)
+    ALL = frozenset(VALUES)
 
 
 # Emoji constants
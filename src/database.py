@@ -3,27 +3,49 @@ Unified database module for AdDesigner Hub Telegram Bot.
 Contains models, session management, and repository functions.
 """
 
+import asyncio
 import logging
+import os
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Type
 from enum import Enum
 from decimal import Decimal
+from uuid import uuid4
 
 from sqlalchemy import (
-    create_engine, Column, Integer, String, DateTime, Boolean, 
-    Text, DECIMAL, ForeignKey, event
+    Integer, BigInteger, String, DateTime, Boolean, 
+    Text, DECIMAL, ForeignKey, CheckConstraint, Index, event, inspect, select, insert, update, func, bindparam
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session, relationship
-from sqlalchemy.engine import Engine
-from contextlib import contextmanager
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, joinedload
+from sqlalchemy.engine import Row, make_url
+from contextlib import asynccontextmanager
 
 from bot_config import settings
 
 logger = logging.getLogger(__name__)
 
-# Database base
-Base = declarative_base()
+class ModelReprMixin:
+    """Repr that reads only already-loaded attributes (never emits a SELECT)."""
+    
+    __repr_attrs__ = ("id",)
+    
+    # Fetch server-generated defaults on INSERT so async sessions never lazy-load them
+    __mapper_args__ = {"eager_defaults": True}
+    
+    def __repr__(self) -> str:
+        loaded = inspect(self).dict
+        values = ", ".join(
+            f"{name}={loaded[name]!r}" if name in loaded else f"{name}=?"
+            for name in self.__repr_attrs__
+        )
+        return f"<{type(self).__name__} {values}>"
+
+
+class Base(ModelReprMixin, DeclarativeBase):
+    """Database base."""
 
 
 # ========================= ENUMS =========================
@@ -49,6 +71,7 @@ class PaymentStatusEnum(Enum):
     PENDING = "pending"
     PAID = "paid"
     FAILED = "failed"
+    EXPIRED = "expired"
     CANCELLED = "cancelled"
 
 
@@ -59,97 +82,193 @@ class CurrencyEnum(Enum):
     USDT = "USDT"
 
 
+# Money is stored as integer minor units: kopecks, cents and 1e-6 USDT
+MINOR_UNITS = {
+    CurrencyEnum.RUB.value: 100,
+    CurrencyEnum.USD.value: 100,
+    CurrencyEnum.USDT.value: 1_000_000,
+}
+
+
+def to_minor_units(amount, currency: str) -> int:
+    """Convert amount in currency units to integer minor units."""
+    return int((Decimal(str(amount)) * MINOR_UNITS[currency]).to_integral_value())
+
+
+def from_minor_units(value: int, currency: str) -> float:
+    """Convert integer minor units to amount in currency units."""
+    return value / MINOR_UNITS[currency]
+
+
+def enum_check(table_name: str, column_name: str, enum_cls: Type[Enum]) -> CheckConstraint:
+    """
+    Restrict a VARCHAR column to enum values.
+    
+    Columns stay plain strings (no native enum types), the database
+    only rejects values outside the enum.
+    """
+    values = ", ".join(f"'{member.value}'" for member in enum_cls)
+    return CheckConstraint(
+        f"{column_name} IN ({values})",
+        name=f"ck_{table_name}_{column_name}"
+    )
+
+
 # ========================= MODELS =========================
 
 class User(Base):
     """User model."""
     __tablename__ = "users"
+    __repr_attrs__ = ("id", "username", "language")
     
-    id = Column(Integer, primary_key=True)  # Telegram user ID
-    username = Column(String(255), nullable=True)
-    full_name = Column(String(255), nullable=False)
-    language = Column(String(10), default="ru")
-    is_active = Column(Boolean, default=True)
-    is_admin = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.now)
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)  # Telegram user ID
+    username: Mapped[Optional[str]] = mapped_column(String(255))
+    full_name: Mapped[str] = mapped_column(String(255))
+    language: Mapped[Optional[str]] = mapped_column(String(10), default="ru")
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    is_admin: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    # default= sends now() in the INSERT: tables created before server_default have no column DEFAULT
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now(), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now())
     
-    # Relationships
-    ads = relationship("Ad", back_populates="user")
-    payments = relationship("Payment", back_populates="user")
+    # Relationships (load explicitly with selectinload, lazy loading raises)
+    ads: Mapped[List["Ad"]] = relationship(back_populates="user", lazy="raise")
+    payments: Mapped[List["Payment"]] = relationship(back_populates="user", lazy="raise")
+    
+    __table_args__ = (
+        enum_check("users", "language", LanguageEnum),
+    )
 
 
 class Ad(Base):
     """Advertisement model."""
     __tablename__ = "ads"
+    __repr_attrs__ = ("id", "user_id", "status")
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    text = Column(Text, nullable=False)
-    media = Column(Text, nullable=True)  # JSON string with media files
-    status = Column(String(20), default="draft")
-    moderator_id = Column(Integer, nullable=True)
-    rejection_reason = Column(Text, nullable=True)
-    published_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.now)
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    text: Mapped[str] = mapped_column(Text)
+    media: Mapped[Optional[str]] = mapped_column(Text)  # JSON string with media files
+    status: Mapped[Optional[str]] = mapped_column(String(20), default="draft")
+    moderator_id: Mapped[Optional[int]] = mapped_column(Integer)
+    rejection_reason: Mapped[Optional[str]] = mapped_column(Text)
+    published_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now(), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Publication details
-    channel_id = Column(String(255), nullable=True)  # Telegram channel ID
-    post_link = Column(Text, nullable=True)  # Link to published post
-    amount_paid = Column(DECIMAL(10, 2), nullable=True)  # Amount paid for this ad
-    placement_duration = Column(String(100), nullable=True)  # e.g., "30 дней", "permanent"
+    channel_id: Mapped[Optional[str]] = mapped_column(String(255))  # Telegram channel ID
+    post_link: Mapped[Optional[str]] = mapped_column(Text)  # Link to published post
+    amount_paid: Mapped[Optional[Decimal]] = mapped_column(DECIMAL(10, 2))  # Amount paid for this ad
+    placement_duration: Mapped[Optional[str]] = mapped_column(String(100))  # e.g., "30 дней", "permanent"
     
     # Relationships
-    user = relationship("User", back_populates="ads")
+    user: Mapped["User"] = relationship(back_populates="ads", lazy="raise")
+    
+    __table_args__ = (
+        enum_check("ads", "status", AdStatusEnum),
+        Index("ix_ads_user_status", "user_id", "status"),
+        # "My ads" list, newest first
+        Index("ix_ads_user_created", "user_id", "created_at"),
+        # Moderation queue by status
+        Index("ix_ads_status_created", "status", "created_at"),
+        Index("ix_ads_channel_status_created", "channel_id", "status", "created_at"),
+    )
 
 
 class Payment(Base):
     """Payment model."""
     __tablename__ = "payments"
+    __repr_attrs__ = ("id", "user_id", "status", "currency", "amount")
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    ad_id = Column(Integer, ForeignKey("ads.id"), nullable=True)
-    amount = Column(DECIMAL(10, 2), nullable=False)
-    currency = Column(String(10), nullable=False)
-    status = Column(String(20), default="pending")
-    provider = Column(String(50), nullable=False)
-    external_id = Column(String(255), nullable=True)
-    paid_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.now)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    ad_id: Mapped[Optional[int]] = mapped_column(ForeignKey("ads.id"))
+    amount: Mapped[int] = mapped_column(BigInteger)  # Minor units of currency
+    currency: Mapped[str] = mapped_column(String(10))
+    status: Mapped[Optional[str]] = mapped_column(String(20), default="pending")
+    provider: Mapped[str] = mapped_column(String(50))
+    external_id: Mapped[Optional[str]] = mapped_column(String(255))
+    paid_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now(), server_default=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="payments")
+    user: Mapped["User"] = relationship(back_populates="payments", lazy="raise")
+    
+    __table_args__ = (
+        enum_check("payments", "currency", CurrencyEnum),
+        enum_check("payments", "status", PaymentStatusEnum),
+        Index("ix_payments_user_status", "user_id", "status"),
+        Index("ix_payments_provider_external", "provider", "external_id"),
+    )
 
 
 class Tariff(Base):
     """Tariff model."""
     __tablename__ = "tariffs"
+    __repr_attrs__ = ("id", "name", "is_active")
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(255), nullable=False)
-    description = Column(String(500), nullable=True)  # Added description field
-    posts_limit = Column(Integer, nullable=False)
-    period_days = Column(Integer, nullable=True)  # None for one-time
-    price_rub = Column(DECIMAL(10, 2), nullable=True)
-    price_usd = Column(DECIMAL(10, 2), nullable=True)
-    price_usdt = Column(DECIMAL(10, 2), nullable=True)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.now)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(255))
+    description: Mapped[Optional[str]] = mapped_column(String(500))  # Added description field
+    posts_limit: Mapped[int] = mapped_column(Integer)
+    period_days: Mapped[Optional[int]] = mapped_column(Integer)  # None for one-time
+    price_rub: Mapped[Optional[int]] = mapped_column(BigInteger)  # Kopecks
+    price_usd: Mapped[Optional[int]] = mapped_column(BigInteger)  # Cents
+    price_usdt: Mapped[Optional[int]] = mapped_column(BigInteger)  # 1e-6 USDT
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now(), server_default=func.now())
+    
+    _PRICE_ATTRS = {
+        CurrencyEnum.RUB.value: "price_rub",
+        CurrencyEnum.USD.value: "price_usd",
+        CurrencyEnum.USDT.value: "price_usdt",
+    }
+    
+    def get_price(self, currency: str) -> Optional[float]:
+        """Get tariff price in currency units."""
+        attr = self._PRICE_ATTRS.get(currency)
+        value = getattr(self, attr) if attr else None
+        return from_minor_units(value, currency) if value is not None else None
 
 
 # ========================= DATABASE ENGINE =========================
 
-# SQLite configuration
-@event.listens_for(Engine, "connect")
+# SQLite configuration: WAL lets readers run alongside the writer,
+# synchronous=NORMAL skips the fsync on every commit (safe with WAL)
+SQLITE_PRAGMAS = (
+    "foreign_keys=ON",
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-65536",
+    "busy_timeout=5000",
+)
+
+
 def set_sqlite_pragma(dbapi_connection, connection_record):
     """Set SQLite pragma for better performance."""
-    if 'sqlite' in str(dbapi_connection):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.execute("PRAGMA journal_mode=WAL")
-        cursor.close()
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+# Async drivers for plain database URLs (e.g. sqlite:///bot.db from old .env files)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Return database URL with an async driver."""
+    url = make_url(database_url)
+    if url.drivername in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[url.drivername])
+    return url.render_as_string(hide_password=False)
 
 
 class DatabaseManager:
@@ -168,26 +287,54 @@ class DatabaseManager:
         if self._engine is None:
             self._init_engine()
     
+    @staticmethod
+    def _get_engine_options(database_url: str) -> Dict[str, Any]:
+        """Get connection pool options for the configured database."""
+        options: Dict[str, Any] = {
+            "pool_pre_ping": True,
+            "pool_recycle": 1800,
+            # Room for the compiled forms of all repository statements
+            "query_cache_size": 1200
+        }
+        
+        if settings.pgbouncer_url:
+            # PgBouncer multiplexes server connections, so keep the app pool small.
+            # Transaction pooling forbids session state like prepared statements: disable
+            # the caches and give each statement a unique name so backends never collide.
+            options.update(
+                pool_size=(os.cpu_count() or 1) * 2 + 1,
+                max_overflow=0,
+                connect_args={
+                    "statement_cache_size": 0,
+                    "prepared_statement_cache_size": 0,
+                    "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__"
+                }
+            )
+        elif not database_url.startswith("sqlite"):
+            # Headroom for bursts of concurrent updates (SQLite keeps the driver default)
+            options.update(pool_size=20, max_overflow=40, pool_timeout=30)
+        
+        return options
+    
     def _init_engine(self):
         """Initialize database engine and session factory."""
         try:
+            database_url = get_async_database_url(settings.pgbouncer_url or settings.database_url)
+            
             # Use connection pooling for better performance
-            self._engine = create_engine(
-                settings.database_url,
-                pool_size=10,
-                max_overflow=20,
-                pool_pre_ping=True,
-                pool_recycle=3600
-            )
-            self._session_factory = sessionmaker(bind=self._engine)
-            logger.info(f"Database engine configured for: {settings.database_url}")
+            self._engine = create_async_engine(database_url, **self._get_engine_options(database_url))
+            if self._engine.dialect.name == "sqlite":
+                event.listen(self._engine.sync_engine, "connect", set_sqlite_pragma)
+            # Keep attributes loaded after commit: handlers read ORM objects outside the session
+            self._session_factory = async_sessionmaker(self._engine, class_=AsyncSession, expire_on_commit=False)
+            logger.info(f"Database engine configured for: {make_url(database_url)}")
             
         except Exception as e:
             logger.error(f"Database configuration error: {e}")
             raise
     
-    @contextmanager
-    def get_session(self):
+    @asynccontextmanager
+    async def get_session(self):
         """Get database session with automatic cleanup."""
         if self._session_factory is None:
             self._init_engine()
@@ -198,117 +345,196 @@ class DatabaseManager:
         session = self._session_factory()
         try:
             yield session
-            session.commit()
+            await session.commit()
         except Exception as e:
-            session.rollback()
+            await session.rollback()
             logger.error(f"Database session error: {e}")
             raise
         finally:
-            session.close()
+            await session.close()
     
-    def init_db(self):
+    async def init_db(self):
         """Initialize database tables."""
         try:
             if self._engine is None:
                 self._init_engine()
             
-            Base.metadata.create_all(self._engine)
+            async with self._engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
             logger.info("Database tables created successfully")
             
             # Create default data
-            with self.get_session() as session:
-                self._create_default_data(session)
+            async with self.get_session() as session:
+                await self._create_default_data(session)
+            
+            await self.warmup_pool()
             
         except Exception as e:
             logger.error(f"Database initialization error: {e}")
             raise
     
-    def _create_default_data(self, session):
+    async def warmup_pool(self):
+        """Open pool_size connections up front so first requests don't pay for connecting."""
+        # SQLite connections are local files (and a thread each with aiosqlite): nothing to warm
+        if self._engine.dialect.name == "sqlite":
+            return
+        
+        pool_size = getattr(self._engine.pool, "size", lambda: 0)()
+        if not pool_size:
+            return
+        
+        async def checkout():
+            async with self._engine.connect():
+                pass
+        
+        # Check out concurrently so the pool really opens pool_size connections
+        await asyncio.gather(*(checkout() for _ in range(pool_size)))
+        logger.info(f"Database pool warmed up with {pool_size} connections")
+    
+    async def dispose(self):
+        """Close all pooled connections."""
+        if self._engine is not None:
+            await self._engine.dispose()
+    
+    async def _create_default_data(self, session: AsyncSession):
         """Create default data if not exists."""
         try:
             # Check if tariffs already exist
-            if session.query(Tariff).count() == 0:
+            tariffs_count = await session.scalar(select(func.count()).select_from(Tariff))
+            if tariffs_count == 0:
                 tariffs = [
-                    Tariff(
-                        name="Базовый",
-                        description="3 публикации в неделю",
-                        posts_limit=3,
-                        period_days=7,
-                        price_rub=500,
-                        price_usd=5,
-                        price_usdt=5
-                    ),
-                    Tariff(
-                        name="Стандарт",
-                        description="10 публикаций в неделю + AI улучшения",
-                        posts_limit=10,
-                        period_days=7,
-                        price_rub=1500,
-                        price_usd=15,
-                        price_usdt=15
-                    ),
-                    Tariff(
-                        name="Премиум",
-                        description="Безлимитные публикации + все возможности",
-                        posts_limit=999,  # Unlimited
-                        period_days=30,
-                        price_rub=3000,
-                        price_usd=30,
-                        price_usdt=30
-                    )
+                    {
+                        "name": "Базовый",
+                        "description": "3 публикации в неделю",
+                        "posts_limit": 3,
+                        "period_days": 7,
+                        "price_rub": to_minor_units(500, "RUB"),
+                        "price_usd": to_minor_units(5, "USD"),
+                        "price_usdt": to_minor_units(5, "USDT")
+                    },
+                    {
+                        "name": "Стандарт",
+                        "description": "10 публикаций в неделю + AI улучшения",
+                        "posts_limit": 10,
+                        "period_days": 7,
+                        "price_rub": to_minor_units(1500, "RUB"),
+                        "price_usd": to_minor_units(15, "USD"),
+                        "price_usdt": to_minor_units(15, "USDT")
+                    },
+                    {
+                        "name": "Премиум",
+                        "description": "Безлимитные публикации + все возможности",
+                        "posts_limit": 999,  # Unlimited
+                        "period_days": 30,
+                        "price_rub": to_minor_units(3000, "RUB"),
+                        "price_usd": to_minor_units(30, "USD"),
+                        "price_usdt": to_minor_units(30, "USDT")
+                    }
                 ]
-                for tariff in tariffs:
-                    session.add(tariff)
-                session.commit()
+                # One executemany INSERT instead of per-object unit of work
+                await session.execute(insert(Tariff), tariffs)
+                await session.commit()
                 logger.info("Default tariffs created")
         except Exception as e:
             logger.error(f"Error creating default data: {e}")
-            session.rollback()
+            await session.rollback()
 
 
 # ========================= REPOSITORY FUNCTIONS =========================
 
+# Prebuilt statements: built once and reused so the compiled form stays cached
+_ACTIVE_USERS = select(User).where(User.is_active == True)
+# Moderation shows the author, so load it in the same query (many-to-one JOIN)
+_ADS_BY_STATUS = select(Ad).options(joinedload(Ad.user)).where(Ad.status == bindparam("status"))
+_ADS_BY_USER = select(Ad).where(Ad.user_id == bindparam("user_id")).order_by(Ad.created_at.desc())
+# "My ads" list only shows these columns: plain rows, no ORM hydration
+_AD_SUMMARIES_BY_USER = (
+    select(
+        Ad.id, Ad.text, Ad.status, Ad.created_at, Ad.channel_id,
+        Ad.post_link, Ad.amount_paid, Ad.placement_duration
+    )
+    .where(Ad.user_id == bindparam("user_id"))
+    .order_by(Ad.created_at.desc())
+)
+_PAYMENTS_BY_USER = select(Payment).where(Payment.user_id == bindparam("user_id"))
+_ACTIVE_TARIFFS = select(Tariff).where(Tariff.is_active == True)
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT
+UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+
 class UserRepository:
     """User repository functions."""
     
     @staticmethod
-    def get_or_create(db: Session, user_id: int, username: str = "", full_name: str = "") -> User:
-        """Get or create user."""
-        user = db.query(User).filter(User.id == user_id).first()
+    async def get_or_create(db: AsyncSession, user_id: int, username: Optional[str] = "",
+                            full_name: Optional[str] = "", language: Optional[str] = "ru") -> User:
+        """
+        Get or create user.
         
-        if not user:
-            user = User(
-                id=user_id,
-                username=username or "unknown",
-                full_name=full_name or "Unknown",
-                language="ru"
-            )
-            db.add(user)
-            db.flush()
+        Existing users are read with a plain SELECT and only written when their
+        username/full name changed. New users are inserted with ON CONFLICT DO NOTHING
+        so concurrent first requests don't fail; language is only set on insert.
+        """
+        username = username or "unknown"
+        full_name = full_name or "Unknown"
+        
+        user = await db.get(User, user_id)
+        if user is None:
+            insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+            if insert is None:
+                # No ON CONFLICT support: plain select-then-insert
+                user = User(id=user_id, username=username, full_name=full_name, language=language)
+                db.add(user)
+                await db.flush()
+                return user
             
+            await db.execute(
+                insert(User)
+                .values(id=user_id, username=username, full_name=full_name, language=language)
+                .on_conflict_do_nothing(index_elements=[User.id])
+            )
+            user = await db.get(User, user_id)
+        elif (user.username, user.full_name) != (username, full_name):
+            user.username = username
+            user.full_name = full_name
+            await db.flush()
+        
         return user
     
     @staticmethod
-    def update_language(db: Session, user_id: int, language: str):
+    async def get_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+        """Get user by ID (identity map first, SELECT only on miss)."""
+        return await db.get(User, user_id)
+    
+    @staticmethod
+    async def update_language(db: AsyncSession, user_id: int, language: str):
         """Update user language."""
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            setattr(user, 'language', language)
-            db.flush()
-        return user
+        stmt = update(User).where(User.id == user_id).values(language=language).returning(User)
+        result = await db.scalars(stmt, execution_options={"populate_existing": True})
+        return result.one_or_none()
     
     @staticmethod
-    def get_all_users(db: Session) -> List[User]:
+    async def get_all_users(db: AsyncSession) -> List[User]:
         """Get all users."""
-        return db.query(User).filter(User.is_active == True).all()
+        result = await db.execute(_ACTIVE_USERS)
+        return list(result.scalars().all())
 
 
 class AdRepository:
     """Ad repository functions."""
     
     @staticmethod
-    def create_ad(db: Session, user_id: int, text: str, media: Optional[str] = None) -> Ad:
-        """Create new ad."""
+    async def create_ad(db: AsyncSession, user_id: int, text: str, media: Optional[str] = None, flush: bool = False) -> Ad:
+        """
+        Create new ad.
+        
+        The INSERT is left to the session's next flush/commit; pass flush=True
+        when the caller needs ad.id before committing.
+        """
         ad = Ad(
             user_id=user_id,
             text=text,
@@ -316,84 +542,101 @@ class AdRepository:
             status="draft"
         )
         db.add(ad)
-        db.flush()
+        if flush:
+            await db.flush()
         return ad
     
     @staticmethod
-    def get_pending_ads(db: Session) -> List[Ad]:
-        """Get pending ads for moderation."""
-        return db.query(Ad).filter(Ad.status == "pending").all()
+    async def get_pending_ads(db: AsyncSession) -> List[Ad]:
+        """Get pending ads for moderation (with authors loaded)."""
+        result = await db.execute(_ADS_BY_STATUS, {"status": "pending"})
+        return list(result.scalars().all())
     
     @staticmethod
-    def get_user_ads(db: Session, user_id: int) -> List[Ad]:
-        """Get user's ads."""
-        return db.query(Ad).filter(Ad.user_id == user_id).all()
+    async def get_user_ads(db: AsyncSession, user_id: int) -> List[Ad]:
+        """Get user's ads, newest first."""
+        result = await db.execute(_ADS_BY_USER, {"user_id": user_id})
+        return list(result.scalars().all())
     
     @staticmethod
-    def update_ad_status(db: Session, ad_id: int, status: str, moderator_id: Optional[int] = None, reason: Optional[str] = None) -> Optional[Ad]:
-        """Update ad status."""
-        ad = db.query(Ad).filter(Ad.id == ad_id).first()
-        if ad:
-            setattr(ad, 'status', status)
-            if moderator_id is not None:
-                setattr(ad, 'moderator_id', moderator_id)
-            if reason is not None:
-                setattr(ad, 'rejection_reason', reason)
-            if status == "published":
-                setattr(ad, 'published_at', datetime.now())
-            db.flush()
-        return ad
+    async def get_user_ad_summaries(db: AsyncSession, user_id: int) -> List[Row]:
+        """Get display columns of user's ads as plain rows, newest first."""
+        result = await db.execute(_AD_SUMMARIES_BY_USER, {"user_id": user_id})
+        return list(result.all())
+    
+    @staticmethod
+    async def update_ad_status(db: AsyncSession, ad_id: int, status: str, moderator_id: Optional[int] = None, reason: Optional[str] = None) -> Optional[Ad]:
+        """Update ad status with a single UPDATE ... RETURNING."""
+        values: Dict[str, Any] = {"status": status}
+        if moderator_id is not None:
+            values["moderator_id"] = moderator_id
+        if reason is not None:
+            values["rejection_reason"] = reason
+        if status == "published":
+            values["published_at"] = func.now()
+        
+        stmt = update(Ad).where(Ad.id == ad_id).values(**values).returning(Ad)
+        result = await db.scalars(stmt, execution_options={"populate_existing": True})
+        return result.one_or_none()
 
 
 class PaymentRepository:
     """Payment repository functions."""
     
     @staticmethod
-    def create_payment(db: Session, user_id: int, amount: Decimal, currency: str, provider: str, ad_id: Optional[int] = None) -> Payment:
-        """Create new payment."""
+    async def create_payment(db: AsyncSession, user_id: int, amount: Decimal, currency: str, provider: str, ad_id: Optional[int] = None, flush: bool = False) -> Payment:
+        """
+        Create new payment.
+        
+        The INSERT is left to the session's next flush/commit; pass flush=True
+        when the caller needs payment.id before committing.
+        """
         payment = Payment(
             user_id=user_id,
             ad_id=ad_id,
-            amount=amount,
+            amount=to_minor_units(amount, currency),
             currency=currency,
             provider=provider,
             status="pending"
         )
         db.add(payment)
-        db.flush()
+        if flush:
+            await db.flush()
         return payment
     
     @staticmethod
-    def update_payment_status(db: Session, payment_id: int, status: str, external_id: Optional[str] = None) -> Optional[Payment]:
-        """Update payment status."""
-        payment = db.query(Payment).filter(Payment.id == payment_id).first()
-        if payment:
-            setattr(payment, 'status', status)
-            if external_id:
-                setattr(payment, 'external_id', external_id)
-            if status == "paid":
-                setattr(payment, 'paid_at', datetime.now())
-            db.flush()
-        return payment
+    async def update_payment_status(db: AsyncSession, payment_id: int, status: str, external_id: Optional[str] = None) -> Optional[Payment]:
+        """Update payment status with a single UPDATE ... RETURNING."""
+        values: Dict[str, Any] = {"status": status}
+        if external_id:
+            values["external_id"] = external_id
+        if status == "paid":
+            values["paid_at"] = func.now()
+        
+        stmt = update(Payment).where(Payment.id == payment_id).values(**values).returning(Payment)
+        result = await db.scalars(stmt, execution_options={"populate_existing": True})
+        return result.one_or_none()
     
     @staticmethod
-    def get_user_payments(db: Session, user_id: int) -> List[Payment]:
+    async def get_user_payments(db: AsyncSession, user_id: int) -> List[Payment]:
         """Get user's payments."""
-        return db.query(Payment).filter(Payment.user_id == user_id).all()
+        result = await db.execute(_PAYMENTS_BY_USER, {"user_id": user_id})
+        return list(result.scalars().all())
 
 
 class TariffRepository:
     """Tariff repository functions."""
     
     @staticmethod
-    def get_active_tariffs(db: Session) -> List[Tariff]:
+    async def get_active_tariffs(db: AsyncSession) -> List[Tariff]:
         """Get active tariffs."""
-        return db.query(Tariff).filter(Tariff.is_active == True).all()
+        result = await db.execute(_ACTIVE_TARIFFS)
+        return list(result.scalars().all())
     
     @staticmethod
-    def get_by_id(db: Session, tariff_id: int) -> Optional[Tariff]:
-        """Get tariff by ID."""
-        return db.query(Tariff).filter(Tariff.id == tariff_id).first()
+    async def get_by_id(db: AsyncSession, tariff_id: int) -> Optional[Tariff]:
+        """Get tariff by ID (identity map first, SELECT only on miss)."""
+        return await db.get(Tariff, tariff_id)
 
 
 # ========================= CONVENIENCE FUNCTIONS =========================
@@ -401,15 +644,15 @@ class TariffRepository:
 # Global database manager instance
 db_manager = DatabaseManager()
 
-def init_db():
+async def init_db():
     """Initialize database."""
-    db_manager.init_db()
+    await db_manager.init_db()
 
 def get_db_session():
     """Get database session."""
     return db_manager.get_session()
 
 # Legacy compatibility
-def init_database():
+async def init_database():
     """Legacy function name."""
-    return init_db()
\ No newline at end of file
+    return await init_db()
\ No newline at end of file
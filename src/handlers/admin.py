@@ -8,8 +8,10 @@ from aiogram import Router, F
 from aiogram.types import Message
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 
-from database import DatabaseManager, User, Ad, AdStatusEnum
+from database import db_manager, Ad, AdStatusEnum
 from utils import (
     get_admin_menu_keyboard,
     MessageLoader, AdminModerationStates, 
@@ -49,17 +51,21 @@ async def moderation_menu(message: Message, state: FSMContext):
 
 async def show_next_ad_for_moderation(message: Message, state: FSMContext):
     """Show next ad for moderation."""
-    db_manager = DatabaseManager()
-    
-    with db_manager.get_session() as db:
-        ad = db.query(Ad).filter(Ad.status == AdStatusEnum.PENDING).first()
+    async with db_manager.get_session() as db:
+        result = await db.execute(
+            select(Ad)
+            .options(joinedload(Ad.user))
+            .where(Ad.status == AdStatusEnum.PENDING.value)
+            .limit(1)
+        )
+        ad = result.scalar_one_or_none()
         
         if not ad:
             await message.answer(MessageLoader.get_message("admin.no_ads_for_moderation"))
             return
         
-        # Get ad author
-        author = db.query(User).filter(User.id == ad.user_id).first()
+        # Author is loaded with the ad
+        author = ad.user
         
         ad_text = f"""
 🔍 <b>Модерация объявления #{getattr(ad, 'id', 0)}</b>
@@ -72,7 +78,7 @@ async def show_next_ad_for_moderation(message: Message, state: FSMContext):
         """
         
         # Handle media
-        if hasattr(ad, 'media') and ad.media is not None:
+        if ad.media is not None:
             try:
                 if isinstance(ad.media, list) and len(ad.media) > 0:
                     ad_text += f"\n📎 <b>Медиа:</b> {len(ad.media)} файлов"
@@ -8,10 +8,11 @@ from aiogram.types import Message
 from aiogram.filters import CommandStart
 from aiogram.fsm.context import FSMContext
 
-from database import User
+from database import User, UserRepository
 from utils import (
     get_language_selection_keyboard, get_main_menu_keyboard,
-    Localization, KeyboardLoader, bot_logger, get_bot_statistics
+    Localization, KeyboardLoader, bot_logger, get_bot_statistics,
+    invalidate_user_info
 )
 from .db_helpers import get_db_session, get_or_create_user
 
@@ -30,7 +31,7 @@ async def start_command(message: Message, state: FSMContext):
         
     await state.clear()
     
-    with get_db_session() as db:
+    async with get_db_session() as db:
         user = await get_or_create_user(
             message.from_user.id, 
             message.from_user.username, 
@@ -71,7 +72,7 @@ async def language_selection(message: Message, state: FSMContext):
     
     logger.info(f"Processing language selection for user {message.from_user.id}: {language_code}")
     
-    with get_db_session() as db:
+    async with get_db_session() as db:
         # Ensure user exists in database
         user = await get_or_create_user(
             message.from_user.id,
@@ -81,13 +82,15 @@ async def language_selection(message: Message, state: FSMContext):
         )
         
         # Update language
-        setattr(user, 'language', language_code)
-        db.commit()
+        await UserRepository.update_language(db, user.id, language_code)
+        await db.commit()
+        # Only after commit: a concurrent read before it would re-cache the old language
+        invalidate_user_info(user.id)
         
         await state.clear()
         
         # Get statistics for social proof
-        stats = get_bot_statistics()
+        stats = await get_bot_statistics()
         
         logger.info(f"User {user.id} selected language: {language_code}")
         
@@ -3,9 +3,9 @@ Utility functions shared across all handlers.
 """
 
 from typing import Optional, Tuple
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import DatabaseManager, User
+from database import db_manager, User, UserRepository
 
 from decimal import Decimal
 
@@ -17,39 +17,26 @@ def get_user_language(user: Optional[User]) -> str:
 
 def get_db_session():
     """Get database session context manager."""
-    db_manager = DatabaseManager()
     return db_manager.get_session()
 
 
-def get_user_and_language(db: Session, user_id: int) -> Tuple[Optional[User], str]:
+async def get_user_and_language(db: AsyncSession, user_id: int) -> Tuple[Optional[User], str]:
     """Get user from database and their language in one call."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await UserRepository.get_by_id(db, user_id)
     language = get_user_language(user)
     return user, language
 
 
 async def get_or_create_user(user_id: int, username: Optional[str] = None, 
                               full_name: Optional[str] = None, 
-                              db: Optional[Session] = None) -> User:
+                              db: Optional[AsyncSession] = None) -> User:
     """Get or create user in database."""
     if not db:
-        with get_db_session() as db:
+        async with get_db_session() as db:
             return await get_or_create_user(user_id, username, full_name, db)
     
-    user = db.query(User).filter(User.id == user_id).first()
-    
-    if not user:
-        user = User(
-            id=user_id,
-            username=username or "unknown",
-            full_name=full_name or "Unknown",
-            language=None  # Let user choose language on first start
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-        
-    return user
+    # Let user choose language on first start
+    return await UserRepository.get_or_create(db, user_id, username, full_name, language=None)
 
 def get_price_amount(currency: str, package_type: str) -> Decimal:
     """Get price amount for currency and package."""
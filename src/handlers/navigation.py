@@ -11,7 +11,6 @@ from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
-from sqlalchemy.orm import Session
 
 from database import AdRepository
 
@@ -57,8 +56,8 @@ async def my_ads_command(message: Message):
         return
         
     # Get user's ads
-    with get_db_session() as db:
-        ads = AdRepository.get_user_ads(db, user_id)
+    async with get_db_session() as db:
+        ads = await AdRepository.get_user_ad_summaries(db, user_id)
     
     if not ads:
         no_ads_text = MessageLoader.get_message("ads.no_ads", language)
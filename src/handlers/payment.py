@@ -3,7 +3,6 @@ Payment handlers for AdDesigner Hub Telegram Bot.
 """
 
 import logging
-from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
@@ -11,12 +10,12 @@ from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
-from sqlalchemy.orm import Session
 
 from database import (
-    DatabaseManager, User, Ad, Payment,
+    db_manager, User, Ad, Payment,
     LanguageEnum, AdStatusEnum, PaymentStatusEnum, CurrencyEnum,
-    UserRepository, AdRepository, PaymentRepository, TariffRepository
+    UserRepository, AdRepository, PaymentRepository, TariffRepository,
+    to_minor_units
 )
 from utils import (
     PaymentStates, UserStates, MessageLoader, KeyboardLoader,
@@ -56,28 +55,27 @@ async def process_package_selection(message: Message, state: FSMContext):
     
     amount = get_price_amount(currency, package_type)
     
-    # Create payment in database
-    db_manager = DatabaseManager()
-        # Check if message has from_user
+    # Check if message has from_user
     if not message.from_user:
         await message.answer(MessageLoader.get_message("payment.user_info_unavailable"))
         return
         
-    with db_manager.get_session() as db:
+    # Create payment in database
+    async with db_manager.get_session() as db:
         payment = Payment(
             user_id=message.from_user.id,
-            amount=amount,
-            currency=CurrencyEnum(currency),
+            amount=to_minor_units(amount, currency),
+            currency=CurrencyEnum(currency).value,
             provider=get_provider_name(currency),
-            status=PaymentStatusEnum.PENDING
+            status=PaymentStatusEnum.PENDING.value
         )
         
         db.add(payment)
-        db.commit()
-        db.refresh(payment)
+        await db.commit()
+        await db.refresh(payment)
         
         # Get user language for keyboard and messages
-        user, language = get_user_and_language(db, message.from_user.id)
+        user, language = await get_user_and_language(db, message.from_user.id)
         
         # Demo payment interface
         payment_text = MessageLoader.get_message(
@@ -130,13 +128,12 @@ async def process_payment_success(message: Message, state: FSMContext):
         await message.answer(MessageLoader.get_message("payment.info_not_found"))
         return
     
-    with get_db_session() as db:
-        payment = db.query(Payment).filter(Payment.id == payment_id).first()
+    async with get_db_session() as db:
+        # paid_at is stamped by the database clock in the same UPDATE
+        payment = await PaymentRepository.update_payment_status(db, payment_id, PaymentStatusEnum.PAID.value)
         
         if payment:
-            setattr(payment, 'status', PaymentStatusEnum.PAID.value)
-            setattr(payment, 'paid_at', datetime.now())
-            db.commit()
+            await db.commit()
             
             success_text = MessageLoader.get_message("payment.success", language)
             
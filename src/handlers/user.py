@@ -103,11 +103,15 @@ async def process_improve_text(message: Message, state: FSMContext):
     try:
         # Improve text with AI
         if settings.openai_api_key:
+            # Text already went through AI in this flow (user edited the result):
+            # ask for a fresh version instead of the cached one
+            bypass_cache = "original_ad_text" in data
+            
             # Save original text for retry
             await state.update_data(original_ad_text=ad_text)
             
             # Improve text using utility function
-            improved_text = await process_ai_improvement(ai_service, ad_text, language)
+            improved_text = await process_ai_improvement(ai_service, ad_text, language, bypass_cache=bypass_cache)
             
             if not improved_text:
                 improved_text = ad_text
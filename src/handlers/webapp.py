@@ -1,13 +1,14 @@
 """
 Telegram Web App handler for tariff selection.
 """
-import json
+import orjson
 import logging
+from decimal import Decimal
 from aiogram import Router, F
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 
-from database import DatabaseManager, AdRepository
+from database import AdRepository
 from services import PublicationService
 from utils import (
     get_user_info_from_message,
@@ -42,7 +43,7 @@ async def handle_webapp_data(message: Message, state: FSMContext):
             await message.answer(error_text)
             return
         
-        data = json.loads(message.web_app_data.data)
+        data = orjson.loads(message.web_app_data.data)
         
         # New unified order data structure
         plan_id = data.get("tariff")  # "basic", "standard", "premium"
@@ -167,15 +168,16 @@ async def handle_webapp_data(message: Message, state: FSMContext):
             return
         
         # Create ad in database
-        with get_db_session() as db:
-            ad = AdRepository.create_ad(
+        async with get_db_session() as db:
+            ad = await AdRepository.create_ad(
                 db=db,
                 user_id=user_id,
                 text=ad_text,
                 media=image_file_id if has_image and image_file_id else None
             )
+            # Commit flushes the INSERT and assigns the id
+            await db.commit()
             ad_id = ad.id
-            db.commit()
         
         # Publish ad to channel
         try:
@@ -190,8 +192,8 @@ async def handle_webapp_data(message: Message, state: FSMContext):
             logger.info(f"[DEBUG] Published ad - username: {channel_username}, channel_id: {channel_id}, message_id: {message_id}")
             
             # Update ad with publication details
-            with get_db_session() as db:
-                updated_ad = AdRepository.update_ad_status(
+            async with get_db_session() as db:
+                updated_ad = await AdRepository.update_ad_status(
                     db=db,
                     ad_id=ad_id,
                     status="published"
@@ -199,9 +201,9 @@ async def handle_webapp_data(message: Message, state: FSMContext):
                 if updated_ad:
                     # Update additional fields
                     updated_ad.channel_id = f"@{channel_username}" if channel_username else str(channel_id)
-                    updated_ad.amount_paid = float(amount)
+                    updated_ad.amount_paid = Decimal(amount)
                     updated_ad.placement_duration = plan_name
-                    db.commit()
+                    await db.commit()
             
             # Create post link
             if channel_username:
@@ -239,7 +241,7 @@ async def handle_webapp_data(message: Message, state: FSMContext):
         # Clear state
         await state.clear()
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"JSON decode error: {e}")
         error_text = MessageLoader.get_message("errors.general", language)
         await message.answer(error_text)
@@ -4,25 +4,95 @@ Main entry point for AdDesigner Hub Telegram Bot.
 
 import asyncio
 import logging
+import secrets
+from aiohttp import web
 from aiogram import Bot, Dispatcher
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder
 from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 
 from bot_config import settings
 from handlers import router
-from utils import setup_logging, init_metrics
+from utils import setup_logging, stop_logging, init_metrics, MessageLoader
 from database import init_db
+from services import get_bot, close_openai_client
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
 
+def create_storage() -> BaseStorage:
+    """Create FSM storage: Redis when configured, in-memory otherwise."""
+    if settings.redis_url:
+        from aiogram.fsm.storage.redis import RedisStorage
+        
+        logger.info("Using Redis FSM storage")
+        return RedisStorage.from_url(
+            settings.redis_url,
+            connection_kwargs={"max_connections": settings.redis_max_connections},
+            key_builder=DefaultKeyBuilder(with_bot_id=True),
+            state_ttl=settings.fsm_ttl_seconds,
+            data_ttl=settings.fsm_ttl_seconds
+        )
+    
+    logger.info("Using in-memory FSM storage")
+    return MemoryStorage()
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher):
+    """Receive updates pushed by Telegram through an aiohttp webhook server."""
+    # Telegram echoes the secret in a header; requests without it are rejected
+    secret_token = settings.webhook_secret or secrets.token_urlsafe(32)
+    await bot.set_webhook(
+        f"{settings.webhook_url.rstrip('/')}{settings.webhook_path}",
+        drop_pending_updates=True,
+        allowed_updates=dp.resolve_used_update_types(),
+        secret_token=secret_token
+    )
+    
+    app = web.Application()
+    SimpleRequestHandler(dispatcher=dp, bot=bot, secret_token=secret_token).register(app, path=settings.webhook_path)
+    setup_application(app, dp, bot=bot)
+    
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.webhook_host, port=settings.webhook_port)
+    await site.start()
+    logger.info(f"Webhook server listening on {settings.webhook_host}:{settings.webhook_port}{settings.webhook_path}")
+    
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+async def run_polling(bot: Bot, dp: Dispatcher):
+    """Poll Telegram for updates (local development)."""
+    # getUpdates is rejected while a webhook is registered
+    await bot.delete_webhook()
+    # Each update runs in its own task, so slow handlers do not block the next batch
+    await dp.start_polling(
+        bot,
+        handle_as_tasks=True,
+        polling_timeout=30,
+        allowed_updates=dp.resolve_used_update_types()
+    )
+
+
 async def main():
     """Main function to run the bot."""
     try:
-        # Initialize database
-        logger.info("Initializing database...")
-        init_db()
+        # Initialize database and warm up localization (independent I/O)
+        logger.info("Initializing database and localization...")
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(init_db())
+            tg.create_task(asyncio.to_thread(MessageLoader.get_localization))
         
         # Initialize metrics
         logger.info("Initializing metrics...")
@@ -30,8 +100,8 @@ async def main():
         
         # Initialize bot and dispatcher
         logger.info("Initializing bot...")
-        bot = Bot(token=settings.telegram_bot_token)
-        storage = MemoryStorage()
+        bot = get_bot()
+        storage = create_storage()
         dp = Dispatcher(storage=storage)
         
         # Register router
@@ -39,14 +109,25 @@ async def main():
         
         logger.info("Bot configuration complete")
         
-        # Start polling
-        logger.info("Starting bot polling...")
-        await dp.start_polling(bot)
+        if settings.webhook_url:
+            logger.info("Starting bot in webhook mode...")
+            await run_webhook(bot, dp)
+        else:
+            logger.info("Starting bot polling...")
+            await run_polling(bot, dp)
         
     except Exception as e:
-        logger.error(f"Error starting bot: {e}")
+        logger.error(f"Error starting bot: {e}", exc_info=True)
         raise
+    finally:
+        await close_openai_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
+    finally:
+        stop_logging()
\ No newline at end of file
@@ -7,14 +7,10 @@ Optimized version with minimal code duplication.
 import logging
 import json
 from typing import Tuple, Optional, Dict
-from openai import AsyncOpenAI
-from bot_config import settings
+from services import get_openai_client, OPENAI_SEMAPHORE
 
 logger = logging.getLogger(__name__)
 
-# Configure OpenAI for moderation
-client = AsyncOpenAI(api_key=settings.openai_api_key)
-
 
 class ModerationPrompts:
     """Centralized storage for moderation prompts to avoid duplication."""
@@ -268,7 +264,8 @@ class ModerationService:
     async def _check_openai_moderation(text: str) -> Tuple[bool, Optional[str]]:
         """Stage 1: OpenAI Moderation API - Fast initial screening."""
         try:
-            response = await client.moderations.create(input=text)
+            async with OPENAI_SEMAPHORE:
+                response = await get_openai_client().moderations.create(input=text)
             
             if response.results and response.results[0].flagged:
                 # Get flagged categories with scores
@@ -296,15 +293,16 @@ class ModerationService:
         try:
             system_prompt = ModerationPrompts.get_gpt4_prompt(language)
             
-            response = await client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Проверь этот текст:\n\n{text}"}
-                ],
-                max_tokens=250,
-                temperature=0.1
-            )
+            async with OPENAI_SEMAPHORE:
+                response = await get_openai_client().chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": f"Проверь этот текст:\n\n{text}"}
+                    ],
+                    max_tokens=250,
+                    temperature=0.1
+                )
             
             result = response.choices[0].message.content.strip()
             logger.info(f"[MODERATION] GPT-4 response: {result}")
@@ -335,16 +333,17 @@ class ModerationService:
             
             system_prompt = ModerationPrompts.get_gpt35_prompt(language, categories_list)
             
-            response = await client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": text}
-                ],
-                max_tokens=200,
-                temperature=0.2,
-                response_format={"type": "json_object"}
-            )
+            async with OPENAI_SEMAPHORE:
+                response = await get_openai_client().chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": text}
+                    ],
+                    max_tokens=200,
+                    temperature=0.2,
+                    response_format={"type": "json_object"}
+                )
             
             result_text = response.choices[0].message.content.strip()
             logger.info(f"[MODERATION] GPT-3.5 response: {result_text}")
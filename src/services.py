@@ -5,17 +5,105 @@ All business logic services combined for simplicity.
 
 import logging
 import asyncio
-from openai import AsyncOpenAI
+import hashlib
+import re
+import time
+from openai import AsyncOpenAI, Timeout
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 from decimal import Decimal
 
+from aiogram import Bot
+
 from bot_config import settings
 
 logger = logging.getLogger(__name__)
 
-# Configure OpenAI
-client = AsyncOpenAI(api_key=settings.openai_api_key)
+# Shared OpenAI client, created on first use. The SDK retries 429s and connection
+# errors with exponential backoff and jitter; the semaphore keeps concurrent
+# requests under the rate limit.
+_openai_client: Optional[AsyncOpenAI] = None
+OPENAI_SEMAPHORE = asyncio.Semaphore(settings.openai_max_concurrency)
+# Fail fast on connect, and don't hold a user for the SDK's 10 minute default read timeout
+OPENAI_TIMEOUT = Timeout(60.0, connect=5.0)
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Get shared OpenAI client (one connection pool for all requests)."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            max_retries=settings.openai_max_retries,
+            timeout=OPENAI_TIMEOUT
+        )
+    return _openai_client
+
+
+async def close_openai_client():
+    """Close shared OpenAI client connections."""
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+
+# Shared Telegram bot: one aiohttp session (connection pool) for all API calls
+_bot: Optional[Bot] = None
+
+
+def get_bot() -> Bot:
+    """Get shared Bot instance."""
+    global _bot
+    if _bot is None:
+        _bot = Bot(token=settings.telegram_bot_token)
+    return _bot
+
+
+# Generated image URLs by prompt hash: key -> (expires_at, url).
+# OpenAI image URLs expire after an hour, so entries live a bit less.
+IMAGE_URL_CACHE: Dict[str, Tuple[float, str]] = {}
+IMAGE_URL_TTL = 50 * 60  # seconds
+IMAGE_URL_CACHE_SIZE = 1024
+IMAGE_SIZE = "1024x1024"
+
+# DALL-E prompt suffix per image style
+STYLE_PROMPTS = {
+    "realistic": "photorealistic, high quality, detailed",
+    "cartoon": "cartoon style, colorful, vector art",
+    "minimalist": "minimalist, clean, simple design",
+    "vintage": "vintage style, retro, aged look"
+}
+
+# Emojis that mark ad text sections (used when formatting AI output)
+SECTION_SPLIT_RE = re.compile(r'(\n|(?=[💼🛠⚡✅📍📩🎯🔥💡👉📞✉️🌟]))')
+SECTION_HEADER_EMOJIS = ('💼', '🛠', '⚡', '✅', '📍', '📩')
+
+# Copywriter system prompt per language; other languages fall back to zh-tw
+SYSTEM_PROMPTS = {
+    "ru": "Ты — креативный копирайтер. Создавай привлекательные рекламные тексты.",
+    "en": "You are a creative copywriter. Create engaging advertising texts.",
+    "zh-tw": "您是一位創意文案作家。創建引人入勝的廣告文案。"
+}
+
+# Moderation result notifications per language; other languages fall back to zh-tw
+AD_APPROVED_MESSAGES = {
+    "ru": "✅ Ваше объявление #{ad_id} одобрено и опубликовано!",
+    "en": "✅ Your advertisement #{ad_id} has been approved and published!",
+    "zh-tw": "✅ 您的廣告 #{ad_id} 已獲批准並發布！"
+}
+AD_REJECTED_MESSAGES = {
+    "ru": "❌ Ваше объявление #{ad_id} отклонено.\n\nПричина: {reason}",
+    "en": "❌ Your advertisement #{ad_id} has been rejected.\n\nReason: {reason}",
+    "zh-tw": "❌ 您的廣告 #{ad_id} 已被拒絕。\n\n原因：{reason}"
+}
+
+# Generated texts by prompt hash: key -> (expires_at, text)
+TEXT_CACHE: Dict[str, Tuple[float, str]] = {}
+TEXT_CACHE_TTL = 60 * 60  # seconds
+TEXT_CACHE_SIZE = 1024
+
+# Text generations in flight by prompt hash: identical concurrent requests share one call
+TEXT_INFLIGHT: Dict[str, "asyncio.Task[str]"] = {}
 
 
 class AIService:
@@ -30,15 +118,10 @@ class AIService:
         if not text:
             return text
         
-        # Remove excessive whitespace but preserve intentional line breaks
-        lines = [line.strip() for line in text.split('\n')]
-        
-        # If text is one long paragraph, try to add structure
-        if len(lines) <= 2 and len(text) > 200:
-            # Look for emoji markers that should start new sections
-            import re
+        # If text is one long paragraph (at most two lines), try to add structure
+        if text.count('\n') <= 1 and len(text) > 200:
             # Split on emoji patterns (common section markers)
-            sections = re.split(r'(\n|(?=[💼🛠⚡✅📍📩🎯🔥💡👉📞✉️🌟]))', text)
+            sections = SECTION_SPLIT_RE.split(text)
             formatted_lines = []
             for section in sections:
                 section = section.strip()
@@ -49,42 +132,62 @@ class AIService:
             result = '\n\n'.join(formatted_lines) if len(formatted_lines) > 1 else text
         else:
             # Join existing lines with single line breaks, add double breaks between major sections
+            # (whitespace is stripped from each line, blank lines are dropped)
             result = []
-            for i, line in enumerate(lines):
+            for line in text.split('\n'):
+                line = line.strip()
                 if line:
                     result.append(line)
                     # Add extra spacing after lines with emojis (section headers)
-                    if any(emoji in line for emoji in ['💼', '🛠', '⚡', '✅', '📍', '📩']):
+                    if any(emoji in line for emoji in SECTION_HEADER_EMOJIS):
                         result.append('')  # Empty line for spacing
             result = '\n'.join(result)
         
         return result
     
     @staticmethod
-    async def generate_text(prompt: str, language: str = "ru") -> str:
-        """Generate text using OpenAI GPT."""
+    async def generate_text(prompt: str, language: str = "ru", bypass_cache: bool = False) -> str:
+        """Generate text using OpenAI GPT (identical prompts share one request and reuse recent results)."""
+        key = hashlib.blake2b(f"{language}|{prompt}".encode(), digest_size=16).hexdigest()
+        cached = TEXT_CACHE.get(key)
+        if cached and not bypass_cache and settings.enable_response_cache and cached[0] > time.monotonic():
+            return cached[1]
+        
+        task = TEXT_INFLIGHT.get(key)
+        if task is None:
+            task = asyncio.ensure_future(AIService._request_text(prompt, language, key))
+            TEXT_INFLIGHT[key] = task
+            task.add_done_callback(lambda _: TEXT_INFLIGHT.pop(key, None))
+        # Shield so one cancelled waiter does not cancel the request for the others
+        return await asyncio.shield(task)
+    
+    @staticmethod
+    async def _request_text(prompt: str, language: str, cache_key: str) -> str:
+        """Send a single text generation request to OpenAI and cache a successful result."""
         try:
-            if language == "ru":
-                system_prompt = "Ты — креативный копирайтер. Создавай привлекательные рекламные тексты."
-            elif language == "en":
-                system_prompt = "You are a creative copywriter. Create engaging advertising texts."
-            else:
-                system_prompt = "您是一位創意文案作家。創建引人入勝的廣告文案。"
+            system_prompt = SYSTEM_PROMPTS.get(language, SYSTEM_PROMPTS["zh-tw"])
             
-            response = await client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.7
-            )
+            async with OPENAI_SEMAPHORE:
+                response = await get_openai_client().chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=500,
+                    temperature=0.7
+                )
             
             content = response.choices[0].message.content
             if content:
                 # Format the text for better visual appearance
                 formatted_text = AIService._format_ad_text(content.strip())
+                if settings.enable_response_cache:
+                    # Re-insert to keep dict order oldest-first, evict the oldest when full
+                    TEXT_CACHE.pop(cache_key, None)
+                    if len(TEXT_CACHE) >= TEXT_CACHE_SIZE:
+                        TEXT_CACHE.pop(next(iter(TEXT_CACHE)))
+                    TEXT_CACHE[cache_key] = (time.monotonic() + TEXT_CACHE_TTL, formatted_text)
                 return formatted_text
             return ""
             
@@ -93,26 +196,32 @@ class AIService:
             return "Ошибка генерации текста" if language == "ru" else "Text generation error"
     
     @staticmethod
-    async def generate_image(prompt: str, style: str = "realistic") -> Optional[str]:
-        """Generate image using DALL-E."""
+    async def generate_image(prompt: str, style: str = "realistic", bypass_cache: bool = False) -> Optional[str]:
+        """Generate image using DALL-E (identical prompts reuse a recent URL)."""
         try:
-            style_prompts = {
-                "realistic": "photorealistic, high quality, detailed",
-                "cartoon": "cartoon style, colorful, vector art",
-                "minimalist": "minimalist, clean, simple design",
-                "vintage": "vintage style, retro, aged look"
-            }
+            enhanced_prompt = f"{prompt}, {STYLE_PROMPTS.get(style, '')}"
             
-            enhanced_prompt = f"{prompt}, {style_prompts.get(style, '')}"
+            cache_key = hashlib.sha256(f"{enhanced_prompt}|{IMAGE_SIZE}".encode()).hexdigest()
+            cached = IMAGE_URL_CACHE.get(cache_key)
+            if cached and not bypass_cache and settings.enable_response_cache and cached[0] > time.monotonic():
+                return cached[1]
             
-            response = await client.images.generate(
-                prompt=enhanced_prompt,
-                n=1,
-                size="1024x1024"
-            )
+            async with OPENAI_SEMAPHORE:
+                response = await get_openai_client().images.generate(
+                    prompt=enhanced_prompt,
+                    n=1,
+                    size=IMAGE_SIZE
+                )
             
             if response and response.data and len(response.data) > 0:
-                return response.data[0].url
+                url = response.data[0].url
+                if url and settings.enable_response_cache:
+                    # Re-insert to keep dict order oldest-first, evict the oldest when full
+                    IMAGE_URL_CACHE.pop(cache_key, None)
+                    if len(IMAGE_URL_CACHE) >= IMAGE_URL_CACHE_SIZE:
+                        IMAGE_URL_CACHE.pop(next(iter(IMAGE_URL_CACHE)))
+                    IMAGE_URL_CACHE[cache_key] = (time.monotonic() + IMAGE_URL_TTL, url)
+                return url
             else:
                 return None
             
@@ -172,16 +281,10 @@ class NotificationService:
     async def send_ad_approved(user_id: int, ad_id: int, language: str = "ru"):
         """Send ad approval notification."""
         try:
-            from aiogram import Bot
-            
-            bot = Bot(token=settings.telegram_bot_token)
+            bot = get_bot()
             
-            if language == "ru":
-                message = f"✅ Ваше объявление #{ad_id} одобрено и опубликовано!"
-            elif language == "en":
-                message = f"✅ Your advertisement #{ad_id} has been approved and published!"
-            else:
-                message = f"✅ 您的廣告 #{ad_id} 已獲批准並發布！"
+            template = AD_APPROVED_MESSAGES.get(language, AD_APPROVED_MESSAGES["zh-tw"])
+            message = template.format(ad_id=ad_id)
             
             await bot.send_message(chat_id=user_id, text=message)
             
@@ -192,16 +295,10 @@ class NotificationService:
     async def send_ad_rejected(user_id: int, ad_id: int, reason: str, language: str = "ru"):
         """Send ad rejection notification."""
         try:
-            from aiogram import Bot
-            
-            bot = Bot(token=settings.telegram_bot_token)
+            bot = get_bot()
             
-            if language == "ru":
-                message = f"❌ Ваше объявление #{ad_id} отклонено.\n\nПричина: {reason}"
-            elif language == "en":
-                message = f"❌ Your advertisement #{ad_id} has been rejected.\n\nReason: {reason}"
-            else:
-                message = f"❌ 您的廣告 #{ad_id} 已被拒絕。\n\n原因：{reason}"
+            template = AD_REJECTED_MESSAGES.get(language, AD_REJECTED_MESSAGES["zh-tw"])
+            message = template.format(ad_id=ad_id, reason=reason)
             
             await bot.send_message(chat_id=user_id, text=message)
             
@@ -216,12 +313,11 @@ class PublicationService:
     async def publish_ad(ad_id: int, text: str, media: Optional[List] = None, language: str = "ru"):
         """Publish ad to target channel. Returns (channel_username, channel_id, message_id)."""
         try:
-            from aiogram import Bot
             from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
             from bot_config import settings
             from utils import MessageLoader
             
-            bot = Bot(token=settings.telegram_bot_token)
+            bot = get_bot()
             
             # Use channel_id_default from config (matches .env CHANNEL_ID_DEFAULT)
             channel_id = settings.channel_id_default
@@ -276,9 +372,6 @@ class PublicationService:
             except Exception as e:
                 logger.warning(f"Could not get channel info: {e}")
             
-            # Close bot session
-            await bot.session.close()
-            
             return (channel_username, channel_id, sent_message.message_id)
             
         except Exception as e:
@@ -4,9 +4,13 @@ All utility functions combined for simplicity.
 """
 
 import logging
+import queue
 import yaml
 import json
 import os
+import time
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Dict, Any, List, Optional
 from enum import Enum
 from datetime import datetime
@@ -26,16 +30,19 @@ logger = logging.getLogger(__name__)
 
 # ========================= STATISTICS =========================
 
-def get_bot_statistics():
+async def get_bot_statistics():
     """Get bot statistics for social proof."""
     try:
-        from database import DatabaseManager, User, Ad
-        from datetime import datetime, timedelta
+        from sqlalchemy import select, func
+        from database import db_manager, User, Ad
         
-        db_manager = DatabaseManager()
-        with db_manager.get_session() as db:
-            total_users = db.query(User).count()
-            total_ads = db.query(Ad).count()
+        async with db_manager.get_session() as db:
+            # Both counts in one round trip
+            result = await db.execute(select(
+                select(func.count()).select_from(User).scalar_subquery(),
+                select(func.count()).select_from(Ad).scalar_subquery()
+            ))
+            total_users, total_ads = result.one()
             
             # AI improvements counter (approximate based on total ads)
             ai_improvements_today = max(5, int(total_ads * 0.1))  # Approximate 10% of ads improved
@@ -258,10 +265,13 @@ class Localization:
     
     def __init__(self):
         self.translations: Dict[str, Dict[str, Any]] = {}
+        # Resolved (unformatted) texts per (key, language); cleared on reload
+        self._lookup = lru_cache(maxsize=4096)(self._resolve_text)
         self.load_translations()
     
     def load_translations(self):
         """Load translations from locale files."""
+        self._lookup.cache_clear()
         try:
             locales_dir = Path("locales")
             if not locales_dir.exists():
@@ -279,31 +289,34 @@ class Localization:
         except Exception as e:
             logger.error(f"Error loading translations: {e}")
     
+    def _resolve_text(self, key: str, language: str) -> str:
+        """Resolve dotted key to text without formatting."""
+        # Split key by dots to navigate nested structure
+        keys = key.split('.')
+        
+        # Get language translations
+        translations = self.translations.get(language, self.translations.get("ru", {}))
+        
+        # Navigate through nested keys
+        text = translations
+        for k in keys:
+            if isinstance(text, dict) and k in text:
+                text = text[k]
+            else:
+                # Fallback to key if not found
+                text = key
+                break
+        
+        # If text is still dict, convert to string
+        return str(text)
+    
     def get_text(self, key: str, language: str = "ru", **kwargs) -> str:
         """Get localized text."""
         try:
-            # Split key by dots to navigate nested structure
-            keys = key.split('.')
-            
-            # Get language translations
-            translations = self.translations.get(language, self.translations.get("ru", {}))
-            
-            # Navigate through nested keys
-            text = translations
-            for k in keys:
-                if isinstance(text, dict) and k in text:
-                    text = text[k]
-                else:
-                    # Fallback to key if not found
-                    text = key
-                    break
-            
-            # If text is still dict, convert to string
-            if isinstance(text, dict):
-                text = str(text)
+            text = self._lookup(key, language)
             
             # Format with kwargs if provided
-            if kwargs and isinstance(text, str):
+            if kwargs:
                 try:
                     text = text.format(**kwargs)
                 except (KeyError, ValueError) as e:
@@ -359,6 +372,10 @@ class KeyboardManager:
 
 # ========================= LOGGING =========================
 
+# Background listener writing queued log records (started once)
+_log_listener: Optional[QueueListener] = None
+
+
 class BotLogger:
     """Simple bot logging service."""
     
@@ -366,15 +383,34 @@ class BotLogger:
         self.setup_logging()
     
     def setup_logging(self):
-        """Setup logging configuration."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('bot.log', encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        """
+        Setup logging configuration.
+        
+        Loggers only enqueue records; file and console writes happen
+        in a QueueListener thread so they never block the event loop.
+        """
+        global _log_listener
+        if _log_listener is not None:
+            return
+        
+        from bot_config import settings
+        
+        log_path = Path(settings.log_file)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = RotatingFileHandler(log_path, maxBytes=50_000_000, backupCount=5, encoding='utf-8')
+        stream_handler = logging.StreamHandler()
+        file_handler.setFormatter(formatter)
+        stream_handler.setFormatter(formatter)
+        
+        log_queue = queue.SimpleQueue()
+        root_logger = logging.getLogger()
+        root_logger.setLevel(settings.log_level.upper())
+        root_logger.addHandler(QueueHandler(log_queue))
+        
+        _log_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+        _log_listener.start()
     
     def log_user_action(self, user_id: int, action: str, details: str = ""):
         """Log user action."""
@@ -486,6 +522,14 @@ def setup_logging():
     return bot_logger
 
 
+def stop_logging():
+    """Flush queued log records and stop the background listener."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
 def init_metrics(port: int = 8000):
     """Initialize metrics collection."""
     return MetricsCollector()
@@ -668,7 +712,8 @@ async def process_ai_improvement(
     ai_service,
     original_text: str,
     language: str,
-    prompt_key: str = "ai_prompts.improve_service_ad"
+    prompt_key: str = "ai_prompts.improve_service_ad",
+    bypass_cache: bool = False
 ) -> Optional[str]:
     """
     Process text with AI improvement.
@@ -679,6 +724,7 @@ async def process_ai_improvement(
         original_text: Original text to improve
         language: User language
         prompt_key: Message key for AI prompt template
+        bypass_cache: Ask the AI again instead of reusing a cached answer
         
     Returns:
         Improved text or None if failed
@@ -696,7 +742,7 @@ async def process_ai_improvement(
         prompt = MessageLoader.get_message(prompt_key, language, text=original_text)
         logger.info(f"Generated prompt for AI (first {100} chars): {prompt[:100]}...")
         
-        improved_text = await ai_service.generate_text(prompt, language)
+        improved_text = await ai_service.generate_text(prompt, language, bypass_cache=bypass_cache)
         logger.info(f"AI returned text ({len(improved_text) if improved_text else 0} chars): {improved_text[:100] if improved_text else 'None'}...")
         
         # Check if improvement was successful
@@ -744,6 +790,17 @@ async def process_ai_improvement(
         return None
 
 
+# Recently seen users: user_id -> (expires_at, username, full_name, language)
+USER_INFO_CACHE: Dict[int, tuple] = {}
+USER_INFO_CACHE_SIZE = 4096
+USER_INFO_TTL = 60  # seconds
+
+
+def invalidate_user_info(user_id: int):
+    """Drop cached user info (call after changing the user's row)."""
+    USER_INFO_CACHE.pop(user_id, None)
+
+
 async def get_user_info_from_message(message, db_session_func, get_or_create_user_func):
     """
     Extract user and language from message with common validation.
@@ -759,18 +816,28 @@ async def get_user_info_from_message(message, db_session_func, get_or_create_use
     if not message.from_user:
         return None, "ru"
     
-    with db_session_func() as db:
-        user = await get_or_create_user_func(
-            message.from_user.id,
-            message.from_user.username or "unknown",
-            message.from_user.full_name or "Unknown",
-            db
-        )
+    user_id = message.from_user.id
+    username = message.from_user.username or "unknown"
+    full_name = message.from_user.full_name or "Unknown"
+    
+    # Known user with unchanged profile: no database round trip
+    cached = USER_INFO_CACHE.get(user_id)
+    if cached and cached[0] > time.monotonic() and cached[1:3] == (username, full_name):
+        return user_id, cached[3]
+    
+    async with db_session_func() as db:
+        user = await get_or_create_user_func(user_id, username, full_name, db)
         # Extract data while session is active
-        user_id = user.id
         language = str(user.language or "ru")
-        # Return simple data, not ORM object
-        return user_id, language
+    
+    # Re-insert to keep dict order oldest-first, evict the oldest when full
+    USER_INFO_CACHE.pop(user_id, None)
+    if len(USER_INFO_CACHE) >= USER_INFO_CACHE_SIZE:
+        USER_INFO_CACHE.pop(next(iter(USER_INFO_CACHE)))
+    USER_INFO_CACHE[user_id] = (time.monotonic() + USER_INFO_TTL, username, full_name, language)
+    
+    # Return simple data, not ORM object
+    return user_id, language
 
 
 async def show_ai_result_with_image(
@@ -791,7 +858,7 @@ async def show_ai_result_with_image(
         ai_result_keyboard_func: Function to get AI result keyboard
     """
     # Get AI improvements count
-    stats = get_bot_statistics()
+    stats = await get_bot_statistics()
     ai_improvements_today = stats.get("ai_improvements_today", 5)
     
     # Get message about final version with improved text
@@ -887,7 +954,7 @@ async def proceed_to_tariff_selection(
     import os
     
     # Get statistics for social proof
-    stats = get_bot_statistics()
+    stats = await get_bot_statistics()
     
     pricing_text = MessageLoader.get_message(
         "tariffs.choose_tariff", 
@@ -951,8 +1018,8 @@ async def handle_tariff_selection(
     if not message.from_user:
         return
     
-    with get_db_func() as db:
-        user, language = get_user_func(db, message.from_user.id)
+    async with get_db_func() as db:
+        user, language = await get_user_func(db, message.from_user.id)
         
         # Save tariff details
         await state.update_data(
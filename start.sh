@@ -9,10 +9,11 @@ set -e
 if [ "$1" = "quick" ]; then
     echo "🚀 Quick start mode..."
     export PYTHONPATH="$(pwd):$PYTHONPATH"
-    nohup .venv/bin/python src/main.py > /tmp/bot.log 2>&1 &
+    # The bot writes its own rotating logs/bot.log; console output would only duplicate it
+    nohup .venv/bin/python src/main.py > /dev/null 2>&1 &
     echo $! > logs/bot.pid
     echo "✅ Bot started in background (PID: $!)"
-    echo "📝 Check logs: tail -f /tmp/bot.log"
+    echo "📝 Check logs: tail -f logs/bot.log"
     exit 0
 fi
 
@@ -179,16 +180,21 @@ echo "🗄️  Initializing database with optimizations..."
 import sys
 sys.path.insert(0, 'src')
 try:
+    import asyncio
     from src.database import db_manager
     print('✅ DatabaseManager Singleton initialized')
     
-    # Initialize database with optimizations
-    db_manager.init_db()
-    print('✅ Database tables created with connection pooling')
+    async def init():
+        # Initialize database with optimizations
+        await db_manager.init_db()
+        print('✅ Database tables created with connection pooling')
+        
+        # Test optimization
+        async with db_manager.get_session() as session:
+            print('✅ Session context manager working')
+        await db_manager.dispose()
     
-    # Test optimization
-    with db_manager.get_session() as session:
-        print('✅ Session context manager working')
+    asyncio.run(init())
         
     print('🚀 Database ready with performance optimizations')
 except Exception as e:
@@ -207,8 +213,10 @@ start_bot() {
         return 0
     fi
     
-    # Start bot in background with optimizations
-    nohup ./venv/bin/python src/main.py > logs/bot.log 2>&1 &
+    # Start bot in background with optimizations. The bot writes its own rotating
+    # logs/bot.log; redirecting console output there too would duplicate every record
+    # and keep growing the rotated file through the inherited fd.
+    nohup ./venv/bin/python src/main.py > /dev/null 2>&1 &
     local pid=$!
     
     # Wait a moment and check if process is still running
@@ -228,6 +236,7 @@ start_bot() {
         echo -e "${RED}❌ Failed to start bot${NC}"
         echo "Last few lines of log:"
         tail -10 logs/bot.log
+        echo "Run ./venv/bin/python src/main.py in the foreground to see errors raised before logging starts"
         return 1
     fi
 }